@@ -0,0 +1,5 @@
+import sys
+from rich.console import Console
+
+# Shared by the services; markup parsing is skipped when output is piped to logs
+console = Console(markup=sys.stdout.isatty(), highlight=False, log_time=False)
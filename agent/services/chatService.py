@@ -1,37 +1,77 @@
-from pymongo import MongoClient
 from dotenv import load_dotenv
 import os
+from collections import Counter
 from datetime import datetime
 from typing import List, Dict, Optional
-from envconfig import MONGO_DB_URI
+from .mongo import get_mongo_client, user_thread_range
 
 class ChatService:
     def __init__(self, db_name: str, collection_name: str):
         self.db_name = db_name
         self.collection_name = collection_name
-        self.client = MongoClient(MONGO_DB_URI)
+        self.client = get_mongo_client()
         self.db = self.client[self.db_name]
         if self.collection_name not in self.db.list_collection_names():
             self.collection = self.db.create_collection(self.collection_name)
         else:
             self.collection = self.db[self.collection_name]
+        # One {_id: thread_id, version} document per chat, bumped on every history change.
+        # Deliberately no user_id/chat_id fields, so the checkpoint purge sweeps leave them alone.
+        self.versions = self.db[f"{self.collection_name}_versions"]
+
+    def _bumpVersion(self, user_id: str, chat_id: str, count: int = 1) -> None:
+        """Increments the history version of a chat"""
+        try:
+            self.versions.update_one(
+                {"_id": f"{user_id}_{chat_id}"},
+                {"$inc": {"version": count}},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"Error bumping chat version: {e}")
+
+    def getChatVersion(self, user_id: str, chat_id: str) -> int:
+        """Gets the history version of a chat, 0 if it was never written"""
+        try:
+            document = self.versions.find_one({"_id": f"{user_id}_{chat_id}"}, {"version": 1})
+            return document["version"] if document else 0
+        except Exception as e:
+            print(f"Error getting chat version: {e}")
+            return 0
         
+    def buildAIMessage(self, message: str, user_id: str, chat_id: str, agent_name: str, timestamp: Optional[datetime] = None) -> Dict:
+        """Builds the chat_history document for an AI message without writing it"""
+        return {
+            'user_id': user_id,
+            'chat_id': chat_id,
+            'thread_id': f"{user_id}_{chat_id}",
+            'role': "AI",
+            'message': message,
+            'agent': agent_name,
+            'timestamp': timestamp or datetime.utcnow()
+        }
+
     def insertAIMessage(self, message: str, user_id: str, chat_id: str, agent_name: str):
         try:   
-            self.collection.insert_one({
-                'user_id': user_id,
-                'chat_id': chat_id,
-                'thread_id': f"{user_id}_{chat_id}",
-                'role': "AI",
-                'message': message,
-                'agent': agent_name,
-                'timestamp': datetime.utcnow()
-            })
+            self.collection.insert_one(self.buildAIMessage(message, user_id, chat_id, agent_name))
+            self._bumpVersion(user_id, chat_id)
             return True
         except Exception as e:
             print(f"Error inserting AI message: {e}")
             return False
 
+    def insertMessages(self, messages: List[Dict]) -> bool:
+        """Inserts a batch of prebuilt message documents in order"""
+        try:
+            if messages:
+                self.collection.insert_many(messages, ordered=True)
+                for (user_id, chat_id), count in Counter((m['user_id'], m['chat_id']) for m in messages).items():
+                    self._bumpVersion(user_id, chat_id, count)
+            return True
+        except Exception as e:
+            print(f"Error inserting messages: {e}")
+            return False
+
     def insertHumanMessage(self, message: str, user_id: str, chat_id: str):
         try:   
             self.collection.insert_one({
@@ -42,6 +82,7 @@ class ChatService:
                 'message': message,
                 'timestamp': datetime.utcnow()
             })
+            self._bumpVersion(user_id, chat_id)
             return True
         except Exception as e:
             print(f"Error inserting human message: {e}")
@@ -106,6 +147,14 @@ class ChatService:
             print(f"Error getting user chat: {e}")
             return []
 
+    def countMessages(self, user_id: str, chat_id: str) -> int:
+        """Counts the messages of a chat without loading them"""
+        try:
+            return self.collection.count_documents({"user_id": user_id, "chat_id": chat_id})
+        except Exception as e:
+            print(f"Error counting chat messages: {e}")
+            return 0
+
     def getChatSummary(self, user_id: str, chat_id: str) -> Optional[Dict]:
         """Gets the chat summary like chat_name, no of message count like that and initial chat creation time like timestamp of the first message of the chat"""
         try:
@@ -161,6 +210,8 @@ class ChatService:
         """Deletes all messages for a specific chat"""
         try:
             result = self.collection.delete_many({"user_id": user_id, "chat_id": chat_id})
+            # Bumped rather than removed so a recreated chat never reuses an old version
+            self._bumpVersion(user_id, chat_id)
             return result.deleted_count > 0
         except Exception as e:
             print(f"Error deleting chat history: {e}")
@@ -170,15 +221,13 @@ class ChatService:
         """Deletes all chats for a specific user"""
         try:
             result = self.collection.delete_many({"user_id": user_id})
+            # Version documents are keyed by thread_id
+            self.versions.update_many({"_id": user_thread_range(user_id)}, {"$inc": {"version": 1}})
             return result.deleted_count > 0
         except Exception as e:
             print(f"Error deleting all user chats: {e}")
             return False
 
     def close_connection(self):
-        """Close the MongoDB connection"""
-        try:
-            self.client.close()
-        except Exception as e:
-            print(f"Error closing connection: {e}")
+        """No-op; see close_mongo_client in .mongo"""
 
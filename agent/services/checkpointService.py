@@ -1,14 +1,96 @@
-from pymongo import MongoClient
-from envconfig import MONGO_DB_URI
-from rich.console import Console
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import WriteConcern, timeout
+from ._console import console
+from .mongo import get_mongo_client, user_thread_range
 
-console = Console()
+# Collections are only created by LangGraph/ChatService, so a short-lived cache is safe
+COLLECTION_NAMES_TTL_SECONDS = 30
+# Upper bound (sent to the server as maxTimeMS) for a single acknowledged purge
+PURGE_TIMEOUT_SECONDS = 30
+PURGE_MAX_WORKERS = 8
+COUNT_MAX_TIME_MS = 5000
+THREAD_ID_INDEX = "thread_id_1"
+# Owned by ChatService, which deletes them with acknowledged writes
+FALLBACK_EXCLUDED_COLLECTIONS = frozenset({"chat_history"})
+# ChatService keys these by thread_id only, without user_id/chat_id fields
+VERSIONS_COLLECTION_SUFFIX = "_versions"
 
 class CheckpointService:
+    # Checkpoint collections already indexed in this process
+    _indexed_collections = set()
+    # Collections found holding user_id/chat_id documents and indexed for the fallback sweeps
+    _owner_indexed_collections = set()
+
     def __init__(self, db_name: str = "SUDAR"):
         self.db_name = db_name
-        self.client = MongoClient(MONGO_DB_URI)
+        self.client = get_mongo_client()
         self.db = self.client[self.db_name]
+        self._collection_names = None
+        self._collection_names_fetched_at = 0.0
+        self._list_collection_names()
+
+    def _list_collection_names(self) -> list:
+        """Return the collection names of the database, cached for a short TTL"""
+        now = time.monotonic()
+        if self._collection_names is None or now - self._collection_names_fetched_at > COLLECTION_NAMES_TTL_SECONDS:
+            self._collection_names = self.db.list_collection_names()
+            self._collection_names_fetched_at = now
+            self._ensure_indexes(self._collection_names)
+        return self._collection_names
+
+    def _ensure_indexes(self, collection_names: list) -> None:
+        """Create the thread_id index used by the purge/count queries once per checkpoint collection"""
+        # LangGraph creates its collections on first write, so new ones are picked up on refresh
+        for collection_name in collection_names:
+            if 'checkpoint' not in collection_name.lower() or collection_name in CheckpointService._indexed_collections:
+                continue
+            try:
+                collection = self.db[collection_name]
+                collection.create_index("thread_id", background=True)
+                CheckpointService._indexed_collections.add(collection_name)
+            except Exception as e:
+                console.print(f"Error ensuring indexes on {collection_name}: {str(e)}", style="red")
+
+    def _ensure_owner_index(self, collection_name: str) -> None:
+        """Create the (user_id, chat_id) index on a collection the fallback sweeps matched"""
+        # LangGraph checkpoints carry no top-level user_id/chat_id, so this index is only built
+        # where the probe has shown those fields exist
+        if collection_name in CheckpointService._owner_indexed_collections:
+            return
+        try:
+            self.db[collection_name].create_index([("user_id", 1), ("chat_id", 1)], background=True)
+            CheckpointService._owner_indexed_collections.add(collection_name)
+        except Exception as e:
+            console.print(f"Error ensuring indexes on {collection_name}: {str(e)}", style="red")
+
+    @staticmethod
+    def _fallback_collections(collection_names: list) -> list:
+        """Collections that may hold top-level user_id/chat_id documents for the fallback sweeps"""
+        # Checkpoint and version documents never carry those fields and have no index on them,
+        # so probing them would scan the largest collections end to end for nothing
+        return [name for name in collection_names
+                if name not in FALLBACK_EXCLUDED_COLLECTIONS
+                and 'checkpoint' not in name.lower()
+                and not name.endswith(VERSIONS_COLLECTION_SUFFIX)]
+
+    @staticmethod
+    def _user_thread_filter(user_id: str) -> dict:
+        """Build a bounded range filter matching every thread_id prefixed with "user_id_"."""
+        return {"thread_id": user_thread_range(user_id)}
+
+    def _delete_from_collections(self, collection_names: list, query: dict, comment: str) -> list:
+        """Run delete_many on each collection concurrently and return (collection_name, deleted_count) pairs"""
+        def delete(collection_name: str):
+            # pymongo.timeout is context-local, so it is entered inside the worker thread
+            with timeout(PURGE_TIMEOUT_SECONDS):
+                result = self.db[collection_name].delete_many(query, comment=comment)
+            return collection_name, result.deleted_count
+
+        if not collection_names:
+            return []
+        with ThreadPoolExecutor(max_workers=min(PURGE_MAX_WORKERS, len(collection_names))) as executor:
+            return list(executor.map(delete, collection_names))
     
     def delete_chat_checkpoints(self, user_id: str, chat_id: str) -> int:
         """Delete all LangGraph checkpoints for a specific chat"""
@@ -16,46 +98,45 @@ class CheckpointService:
             # LangGraph stores checkpoints with thread_id format like "user_id_chat_id"
             thread_id = f"{user_id}_{chat_id}"
             
+            collection_names = self._list_collection_names()
+
             # Get all collections that might contain checkpoints
             # LangGraph typically uses collections like 'checkpoints', 'checkpoint_blobs', etc.
-            checkpoint_collections = [name for name in self.db.list_collection_names() 
+            checkpoint_collections = [name for name in collection_names
                                     if 'checkpoint' in name.lower()]
             
             total_deleted = 0
             
-            for collection_name in checkpoint_collections:
-                collection = self.db[collection_name]
-                
-                # Delete documents that match the thread_id
-                # LangGraph stores checkpoints with 'thread_id' field
-                result = collection.delete_many({"thread_id": thread_id})
-                deleted_count = result.deleted_count
+            # Delete documents that match the thread_id
+            # LangGraph stores checkpoints with 'thread_id' field
+            purged = self._delete_from_collections(
+                checkpoint_collections, {"thread_id": thread_id}, comment="sudar.purge_chat"
+            )
+            for collection_name, deleted_count in purged:
                 total_deleted += deleted_count
                 
                 if deleted_count > 0:
                     console.print(f"Deleted {deleted_count} checkpoints from {collection_name} for chat {chat_id}", style="green")
             
-            # Also check for any documents with chat_id field directly, but exclude chat_history
-            # as that should be handled by ChatService
-            excluded_collections = {'chat_history'}
-            
-            for collection_name in self.db.list_collection_names():
-                if collection_name in excluded_collections:
-                    continue
-                    
+            # Also check for any documents with chat_id field directly, but only in collections
+            # that can carry it (chat_history is handled by ChatService)
+            chat_filter = {"chat_id": chat_id, "user_id": user_id}
+
+            for collection_name in self._fallback_collections(collection_names):
                 collection = self.db[collection_name]
                 
                 # Try to delete by chat_id if the field exists
                 try:
-                    result = collection.delete_many({
-                        "chat_id": chat_id,
-                        "user_id": user_id
-                    })
-                    deleted_count = result.deleted_count
-                    total_deleted += deleted_count
-                    
-                    if deleted_count > 0:
-                        console.print(f"Deleted {deleted_count} documents from {collection_name} for chat {chat_id}", style="green")
+                    # Probe so collections without matching documents are not swept by delete_many
+                    if collection.count_documents(chat_filter, limit=1) == 0:
+                        continue
+                    self._ensure_owner_index(collection_name)
+                    # Best-effort cleanup without waiting for acknowledgement; the result carries
+                    # no deleted_count, so nothing is added to total_deleted
+                    collection.with_options(write_concern=WriteConcern(w=0)).delete_many(
+                        chat_filter, comment="sudar.purge_chat"
+                    )
+                    console.print(f"Queued cleanup of documents in {collection_name} for chat {chat_id}", style="green")
                 except Exception:
                     # Ignore collections that don't have these fields
                     pass
@@ -72,36 +153,42 @@ class CheckpointService:
     def delete_user_checkpoints(self, user_id: str) -> int:
         """Delete all checkpoints for a specific user"""
         try:
+            collection_names = self._list_collection_names()
+
             # Get all collections that might contain checkpoints
-            checkpoint_collections = [name for name in self.db.list_collection_names() 
+            checkpoint_collections = [name for name in collection_names
                                     if 'checkpoint' in name.lower()]
             
             total_deleted = 0
             
-            for collection_name in checkpoint_collections:
-                collection = self.db[collection_name]
-                
-                # Delete documents that match thread_id pattern (user_id_*)
-                result = collection.delete_many({
-                    "thread_id": {"$regex": f"^{user_id}_"}
-                })
-                deleted_count = result.deleted_count
+            # Delete documents that match thread_id pattern (user_id_*)
+            purged = self._delete_from_collections(
+                checkpoint_collections, self._user_thread_filter(user_id), comment="sudar.purge_user"
+            )
+            for collection_name, deleted_count in purged:
                 total_deleted += deleted_count
                 
                 if deleted_count > 0:
                     console.print(f"Deleted {deleted_count} checkpoints from {collection_name} for user {user_id}", style="green")
             
-            # Also check for any documents with user_id field directly
-            for collection_name in self.db.list_collection_names():
+            # Also check for any documents with user_id field directly, but only in collections
+            # that can carry it (chat_history is handled by ChatService)
+            user_filter = {"user_id": user_id}
+
+            for collection_name in self._fallback_collections(collection_names):
                 collection = self.db[collection_name]
                 
                 try:
-                    result = collection.delete_many({"user_id": user_id})
-                    deleted_count = result.deleted_count
-                    total_deleted += deleted_count
-                    
-                    if deleted_count > 0:
-                        console.print(f"Deleted {deleted_count} documents from {collection_name} for user {user_id}", style="green")
+                    # Probe so collections without matching documents are not swept by delete_many
+                    if collection.count_documents(user_filter, limit=1) == 0:
+                        continue
+                    self._ensure_owner_index(collection_name)
+                    # Best-effort cleanup without waiting for acknowledgement; the result carries
+                    # no deleted_count, so nothing is added to total_deleted
+                    collection.with_options(write_concern=WriteConcern(w=0)).delete_many(
+                        user_filter, comment="sudar.purge_user"
+                    )
+                    console.print(f"Queued cleanup of documents in {collection_name} for user {user_id}", style="green")
                 except Exception:
                     # Ignore collections that don't have user_id field
                     pass
@@ -118,7 +205,7 @@ class CheckpointService:
     def get_checkpoint_collections(self) -> list:
         """Get list of collections that contain checkpoints"""
         try:
-            return [name for name in self.db.list_collection_names() 
+            return [name for name in self._list_collection_names()
                    if 'checkpoint' in name.lower()]
         except Exception as e:
             console.print(f"Error getting checkpoint collections: {str(e)}", style="red")
@@ -136,12 +223,16 @@ class CheckpointService:
                 if chat_id:
                     # Count for specific chat
                     thread_id = f"{user_id}_{chat_id}"
-                    count = collection.count_documents({"thread_id": thread_id})
+                    query = {"thread_id": thread_id}
                 else:
                     # Count for all user chats
-                    count = collection.count_documents({
-                        "thread_id": {"$regex": f"^{user_id}_"}
-                    })
+                    query = self._user_thread_filter(user_id)
+
+                # Pin the plan to the thread_id index when it is known to exist
+                if collection_name in CheckpointService._indexed_collections:
+                    count = collection.count_documents(query, hint=THREAD_ID_INDEX, maxTimeMS=COUNT_MAX_TIME_MS)
+                else:
+                    count = collection.count_documents(query, maxTimeMS=COUNT_MAX_TIME_MS)
                 
                 total_count += count
             
@@ -152,8 +243,4 @@ class CheckpointService:
             return 0
     
     def close_connection(self):
-        """Close the MongoDB connection"""
-        try:
-            self.client.close()
-        except Exception as e:
-            console.print(f"Error closing connection: {str(e)}", style="red")
\ No newline at end of file
+        """No-op; see close_mongo_client in .mongo"""
\ No newline at end of file
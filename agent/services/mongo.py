@@ -0,0 +1,37 @@
+from functools import lru_cache
+from pymongo import MongoClient
+from envconfig import MONGO_DB_URI
+
+
+@lru_cache(maxsize=1)
+def get_mongo_client() -> MongoClient:
+    """Returns the process-wide MongoDB client shared by every service"""
+    return MongoClient(
+        MONGO_DB_URI,
+        appname="sudar-ai",
+        maxPoolSize=32,
+        minPoolSize=4,
+        serverSelectionTimeoutMS=3000,
+        socketTimeoutMS=15000,
+        # zstd/snappy come from the pymongo[snappy,zstd] extras in requirements.txt; without them
+        # PyMongo warns on every client creation. The server uses the first listed codec it supports
+        compressors="zstd,snappy,zlib",
+    )
+
+
+def user_thread_range(user_id: str) -> dict:
+    """Bounded range condition matching every thread_id that starts with "<user_id>_"."""
+    prefix = f"{user_id}_"
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return {"$gte": prefix, "$lt": upper}
+
+
+def close_mongo_client() -> None:
+    """Close the shared MongoDB client; the next get_mongo_client() call opens a new one
+
+    Called once at application shutdown. The services' close_connection() methods do not
+    close it, since the compiled agent's MongoDBSaver holds the same client.
+    """
+    if get_mongo_client.cache_info().currsize:
+        get_mongo_client().close()
+        get_mongo_client.cache_clear()
@@ -1,20 +1,98 @@
+from typing import Optional
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import Filter, FieldCondition, MatchValue
+from qdrant_client.http.models import Filter, FieldCondition, FilterSelector, MatchValue, PayloadSchemaType, WriteOrdering
 from envconfig import QDRANT_URL
-from rich.console import Console
+from ._console import console
 
-console = Console()
+DELETE_BATCH_SIZE = 1024
 
 class VectorService:
     def __init__(self):
         self.client = QdrantClient(url=QDRANT_URL)
         self.collection_name = "sudar-ai"
+        # Filled in by _ensure_collection(); the constructor never touches the network
+        self._collection_exists: Optional[bool] = None
+
+    def _ensure_collection(self) -> bool:
+        """Check whether the collection exists, remembering a positive answer for the process lifetime"""
+        # Called lazily from inside each public method's try, so a Qdrant outage degrades to 0 results.
+        # A missing collection is re-checked on every call since ingestion may create it later
+        if not self._collection_exists:
+            self._collection_exists = self.client.collection_exists(collection_name=self.collection_name)
+            if self._collection_exists:
+                self._ensure_payload_indexes()
+        return self._collection_exists
+
+    def _ensure_payload_indexes(self) -> None:
+        """Create keyword payload indexes on the fields used by delete/count filters"""
+        for field_name in ("user_id", "chat_id"):
+            try:
+                self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field_name,
+                    field_schema=PayloadSchemaType.KEYWORD
+                )
+            except Exception as e:
+                # Index already exists or the server rejected it; filters still work unindexed
+                console.print(f"Could not create payload index on '{field_name}': {str(e)}", style="yellow")
+
+    def _delete_points(self, query_filter: Filter) -> int:
+        """Delete every point matching the filter in a single request and return roughly how many matched"""
+        # The approximate count is a cardinality estimate that can round a small chat down to 0,
+        # so it is only reported and never used to skip the (idempotent) delete
+        points_count = self.client.count(
+            collection_name=self.collection_name,
+            count_filter=query_filter,
+            exact=False
+        ).count
+
+        try:
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=FilterSelector(filter=query_filter),
+                wait=False,
+                ordering=WriteOrdering.WEAK
+            )
+        except Exception as e:
+            console.print(f"Filter delete failed, deleting by point IDs instead: {str(e)}", style="yellow")
+            points_count = self._delete_points_in_batches(query_filter)
+
+        return points_count
+
+    def _delete_points_in_batches(self, query_filter: Filter) -> int:
+        """Scroll matching point IDs page by page and delete them in fixed-size batches"""
+        total_deleted = 0
+        next_offset = None
+
+        while True:
+            points, next_offset = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=query_filter,
+                limit=DELETE_BATCH_SIZE,
+                offset=next_offset,
+                with_payload=False,
+                with_vectors=False
+            )
+
+            batch_ids = [point.id for point in points]
+            if batch_ids:
+                self.client.delete(
+                    collection_name=self.collection_name,
+                    points_selector=batch_ids,
+                    wait=False
+                )
+                total_deleted += len(batch_ids)
+
+            if next_offset is None:
+                break
+
+        return total_deleted
     
     def delete_chat_embeddings(self, user_id: str, chat_id: str) -> int:
         """Delete all vector embeddings for a specific chat"""
         try:
             # Check if collection exists
-            if not self.client.collection_exists(collection_name=self.collection_name):
+            if not self._ensure_collection():
                 console.print(f"Vector DB collection '{self.collection_name}' does not exist!", style="yellow")
                 return 0
             
@@ -26,24 +104,10 @@ class VectorService:
                 ]
             )
             
-            # First, get the points to count them
-            points_info = self.client.scroll(
-                collection_name=self.collection_name,
-                scroll_filter=query_filter,
-                limit=10000,  # Large limit to get all matching points
-                with_payload=False,
-                with_vectors=False
-            )
-            
-            point_ids = [point.id for point in points_info[0]]
-            points_count = len(point_ids)
+            # Delete by filter so Qdrant resolves the matching points server-side
+            points_count = self._delete_points(query_filter)
             
             if points_count > 0:
-                # Delete the points by IDs
-                self.client.delete(
-                    collection_name=self.collection_name,
-                    points_selector=point_ids
-                )
                 console.print(f"Deleted {points_count} vector embeddings for chat {chat_id}", style="green")
             else:
                 console.print(f"No vector embeddings found for chat {chat_id}", style="yellow")
@@ -58,7 +122,7 @@ class VectorService:
         """Delete all vector embeddings for a specific user"""
         try:
             # Check if collection exists
-            if not self.client.collection_exists(collection_name=self.collection_name):
+            if not self._ensure_collection():
                 console.print(f"Vector DB collection '{self.collection_name}' does not exist!", style="yellow")
                 return 0
             
@@ -69,24 +133,10 @@ class VectorService:
                 ]
             )
             
-            # First, get the points to count them
-            points_info = self.client.scroll(
-                collection_name=self.collection_name,
-                scroll_filter=query_filter,
-                limit=10000,  # Large limit to get all matching points
-                with_payload=False,
-                with_vectors=False
-            )
-            
-            point_ids = [point.id for point in points_info[0]]
-            points_count = len(point_ids)
+            # Delete by filter so Qdrant resolves the matching points server-side
+            points_count = self._delete_points(query_filter)
             
             if points_count > 0:
-                # Delete the points by IDs
-                self.client.delete(
-                    collection_name=self.collection_name,
-                    points_selector=point_ids
-                )
                 console.print(f"Deleted {points_count} vector embeddings for user {user_id}", style="green")
             else:
                 console.print(f"No vector embeddings found for user {user_id}", style="yellow")
@@ -101,7 +151,7 @@ class VectorService:
         """Get count of embeddings for a user or specific chat"""
         try:
             # Check if collection exists
-            if not self.client.collection_exists(collection_name=self.collection_name):
+            if not self._ensure_collection():
                 return 0
             
             # Create filter
@@ -111,19 +161,11 @@ class VectorService:
             
             query_filter = Filter(must=filter_conditions)
             
-            # Get points count
-            points_info = self.client.scroll(
-                collection_name=self.collection_name,
-                scroll_filter=query_filter,
-                limit=1,
-                with_payload=False,
-                with_vectors=False
-            )
-            
-            # Get total count using count method
+            # Approximate count is served from segment metadata and is enough for reporting
             count_result = self.client.count(
                 collection_name=self.collection_name,
-                count_filter=query_filter
+                count_filter=query_filter,
+                exact=False
             )
             
             return count_result.count
@@ -1,12 +1,9 @@
-from langchain_ollama import ChatOllama
 from langgraph_supervisor import create_supervisor
 from .tools import DocumentRetrieverTool, WebSearchTool, WebScraperTool, SaveContentTool
-from langchain_google_genai import ChatGoogleGenerativeAI
 from .subagents import ReActSubAgent
+from .services.mongo import get_mongo_client
 from .prompts import contentResearcherPrompt, worksheetGeneratorPrompt, supervisorPrompt
-from langchain_groq import ChatGroq
 from langgraph.checkpoint.mongodb import MongoDBSaver
-from pymongo import MongoClient
 from envconfig import GOOGLE_API_KEY, GOOGLE_MODEL_NAME, OLLAMA_MODEL, MODEL_PROVIDER, GROQ_API_KEY, GROQ_MODEL_NAME, MONGO_DB_URI, OLLAMA_THINKING
 
 class TeachAssistAgent:
@@ -15,17 +12,21 @@ class TeachAssistAgent:
         # Use provided parameters or fallback to environment variables
         provider = model_provider or MODEL_PROVIDER
         
+        # Provider SDKs are imported lazily so only the selected one is loaded
         if provider == 'groq':
+            from langchain_groq import ChatGroq
             model = model_name or GROQ_MODEL_NAME
             self.llm_model = ChatGroq(model=model)
         elif provider == 'google':
+            from langchain_google_genai import ChatGoogleGenerativeAI
             model = model_name or GOOGLE_MODEL_NAME
             self.llm_model = ChatGoogleGenerativeAI(model=model)
         else:  # default to ollama
+            from langchain_ollama import ChatOllama
             model = model_name or OLLAMA_MODEL
             self.llm_model = ChatOllama(model=model, reasoning=True if OLLAMA_THINKING == 'true' else False)
 
-        self.client = MongoClient(MONGO_DB_URI)
+        self.client = get_mongo_client()
         self.memory = MongoDBSaver(
             client=self.client,
             connection_string=MONGO_DB_URI,
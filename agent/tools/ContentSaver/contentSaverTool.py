@@ -12,7 +12,8 @@ import tempfile
 def saveContent(content: str, title: str)->str:
   user_id, chat_id = getUserIdChatId()
   pdf_filename = f"{title.strip()}.pdf"
-  object_name = f"{user_id}/{chat_id}/{pdf_filename}"
+  # Generated files share the "generated/" prefix the API lists without tag lookups
+  object_name = f"{user_id}/{chat_id}/generated/{pdf_filename}"
   rprint(f"[green]Saving {object_name} to the bucket...[green]")
   
   temp_md_file = None
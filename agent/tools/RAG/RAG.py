@@ -23,10 +23,13 @@ def RAG(object_key: str, query: str) -> Union[str, None]:
       rprint("[yellow]No relevant chunks retrieved for query.[/yellow]")
       return None
 
-    context = ""
-    for j, chunk in enumerate(chunks):
-      content = chunk.get("content", "")
-      context += f"Document: {j + 1}\n{content}\n"
+    if not any(chunk.get("content") for chunk in chunks):
+      rprint("[yellow]Retrieved chunks have no content.[/yellow]")
+      return None
+
+    context = "".join(
+      f"Document: {j + 1}\n{chunk.get('content', '')}\n" for j, chunk in enumerate(chunks)
+    )
 
     return context
 
@@ -1,4 +1,5 @@
 import os
+import re
 from contextvars import ContextVar
 from typing import Optional, Tuple
 from envconfig import USER_ID, CHAT_ID
@@ -7,6 +8,12 @@ _user_chat_context: ContextVar[Optional[Tuple[str, str]]] = ContextVar(
     "user_chat_context", default=None
 )
 
+# Maps every ASCII character that is not alphanumeric or '_' to '_'
+_SANITIZE_TABLE = str.maketrans({
+    c: '_' for c in map(chr, range(128)) if not (c.isalnum() or c == '_')
+})
+_NON_WORD_RE = re.compile(r'\W')
+
 def sanitize_collection_name(name: str) -> str:
     """
     Sanitizes a string to be used as a ChromaDB collection name.
@@ -20,7 +27,10 @@ def sanitize_collection_name(name: str) -> str:
         - Ends with alphanumeric character
     """
     # Remove all non-alphanumeric characters except underscores
-    sanitized = ''.join(char if char.isalnum() or char == '_' else '_' for char in name)
+    if name.isascii():
+        sanitized = name.translate(_SANITIZE_TABLE)
+    else:
+        sanitized = _NON_WORD_RE.sub('_', name)
 
     # Ensure starts with a letter
     if not sanitized[0].isalpha():
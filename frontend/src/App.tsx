@@ -3,8 +3,8 @@ import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import toast, { Toaster } from 'react-hot-toast';
 import dayjs from "dayjs";
 
-import api from "./api/client";
-import type { AgentMessage, ChatMessageResponse, ChatMessageRequest, ChatSummary, FileMetadata, UpdateChatNameResponse, DeleteChatResponse } from "./api/types";
+import api, { streamChatMessage } from "./api/client";
+import type { AgentMessage, ChatMessageRequest, ChatSummary, FileMetadata, UpdateChatNameResponse, DeleteChatResponse } from "./api/types";
 import ChatList from "./components/ChatList";
 import ChatWindow from "./components/ChatWindow";
 
@@ -113,12 +113,17 @@ const App = () => {
     }
   }, [activeChatId, chatsQuery.data]);
 
-  const sendMessageMutation = useMutation<ChatMessageResponse, Error, ChatMessageRequest, { previousMessages?: AgentMessage[] }>({
+  const appendMessage = (chatId: string, message: AgentMessage) => {
+    queryClient.setQueryData<AgentMessage[]>(["messages", chatId], (old) => [...(old || []), message]);
+  };
+
+  const sendMessageMutation = useMutation<void, Error, ChatMessageRequest, { previousMessages?: AgentMessage[] }>({
     mutationKey: ["send-message", activeChatId],
     mutationFn: async (payload: ChatMessageRequest) => {
       if (!activeChatId) throw new Error("Select a chat before sending messages");
-      const response = await api.post<ChatMessageResponse>(`/api/chats/${activeChatId}/messages`, payload);
-      return response.data;
+      const chatId = activeChatId;
+      // Agent replies are appended to the cached history as they stream in
+      await streamChatMessage(chatId, payload, (message) => appendMessage(chatId, message));
     },
     onMutate: async (payload: ChatMessageRequest) => {
       if (!activeChatId) return { previousMessages: undefined };
@@ -157,7 +162,6 @@ const App = () => {
     onSuccess: async () => {
       if (!activeChatId) return;
       await Promise.all([
-        queryClient.invalidateQueries({ queryKey: ["messages", activeChatId] }),
         queryClient.invalidateQueries({ queryKey: ["chats"] }),
         queryClient.invalidateQueries({ queryKey: ["generated-files", activeChatId] }),
         queryClient.invalidateQueries({ queryKey: ["uploaded-files", activeChatId] }),
@@ -315,13 +319,9 @@ const App = () => {
         if (model_provider) requestPayload.model_provider = model_provider;
         if (model_name) requestPayload.model_name = model_name;
         
-        await api.post<ChatMessageResponse>(`/api/chats/${newChatId}/messages`, requestPayload);
-        
-        // Refresh the messages to get the full conversation including agent response
-        await Promise.all([
-          queryClient.invalidateQueries({ queryKey: ["messages", newChatId] }),
-          queryClient.invalidateQueries({ queryKey: ["chats"] }),
-        ]);
+        // Append the agent replies to the optimistic conversation as they stream in
+        await streamChatMessage(newChatId, requestPayload, (agentMessage) => appendMessage(newChatId, agentMessage));
+        await queryClient.invalidateQueries({ queryKey: ["chats"] });
       } catch (error) {
         // On error, remove the optimistic updates
         queryClient.setQueryData<AgentMessage[]>(["messages", newChatId], []);
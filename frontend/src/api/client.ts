@@ -1,8 +1,56 @@
 import axios from "axios";
 
+import type { AgentMessage, ChatMessageRequest } from "./types";
+
 const api = axios.create({
   baseURL: import.meta.env.VITE_API_BASE_URL ?? "http://localhost:8000",
   withCredentials: false,
 });
 
+/**
+ * Sends a chat message and reads the server-sent event stream of agent replies,
+ * calling `onMessage` for each reply as soon as it arrives.
+ */
+export const streamChatMessage = async (
+  chatId: string,
+  payload: ChatMessageRequest,
+  onMessage: (message: AgentMessage) => void,
+): Promise<void> => {
+  const response = await fetch(`${api.defaults.baseURL}/api/chats/${chatId}/messages`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", Accept: "text/event-stream" },
+    body: JSON.stringify(payload),
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(`Request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const frame = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf("\n\n");
+
+      let event = "message";
+      let data = "";
+      for (const line of frame.split("\n")) {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) data += line.slice(5).trim();
+      }
+
+      if (event === "message") onMessage(JSON.parse(data) as AgentMessage);
+      else if (event === "error") throw new Error(JSON.parse(data).detail);
+    }
+  }
+};
+
 export default api;
@@ -13,10 +13,6 @@ export interface AgentMessage {
   timestamp: string;
 }
 
-export interface ChatMessageResponse {
-  messages: AgentMessage[];
-}
-
 export interface FileMetadata {
   object_key: string;
   file_name: string;
@@ -2,50 +2,38 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import weakref
 from functools import lru_cache
-from typing import Optional
+from typing import Optional, Tuple
 
-from minio import Minio
+from fastapi import Depends
 
 from agent.teachAssist import TeachAssistAgent
 from agent.services import ChatService
 from agent.services.vectorService import VectorService
 from agent.services.checkpointService import CheckpointService
 from envconfig import (
-    MINIO_ACCESS_KEY,
-    MINIO_BUCKET_NAME,
-    MINIO_SECRET_KEY,
-    MINIO_URL,
+    GOOGLE_MODEL_NAME,
+    GROQ_MODEL_NAME,
+    MODEL_PROVIDER,
+    OLLAMA_MODEL,
     USER_ID,
 )
 
+from .message_writer import MessageWriter
+from .minio_client import get_minio_client  # noqa: F401  (re-exported for the endpoints)
+
 logger = logging.getLogger(__name__)
 
 
 @lru_cache(maxsize=1)
-def get_minio_client() -> Minio:
-    """Returns a cached MinIO client instance."""
-
-    endpoint = str(MINIO_URL).replace("http://", "").replace("https://", "")
-    client = Minio(
-        endpoint=endpoint,
-        access_key=MINIO_ACCESS_KEY,
-        secret_key=MINIO_SECRET_KEY,
-        secure=MINIO_URL.startswith("https"),
-    )
-    logger.debug("Initialised MinIO client for endpoint %s", endpoint)
-
-    # Ensure bucket exists
-    if not client.bucket_exists(MINIO_BUCKET_NAME):
-        logger.info("Bucket %s missing; creating it now", MINIO_BUCKET_NAME)
-        client.make_bucket(MINIO_BUCKET_NAME)
-
-    return client
+def get_chat_service() -> ChatService:
+    return ChatService(db_name="SUDAR", collection_name="chat_history")
 
 
 @lru_cache(maxsize=1)
-def get_chat_service() -> ChatService:
-    return ChatService(db_name="SUDAR", collection_name="chat_history")
+def get_message_writer() -> MessageWriter:
+    return MessageWriter(get_chat_service())
 
 
 @lru_cache(maxsize=1)
@@ -58,31 +46,57 @@ def get_checkpoint_service() -> CheckpointService:
     return CheckpointService(db_name="SUDAR")
 
 
-@lru_cache(maxsize=1)
-def get_compiled_agent():
-    agent = TeachAssistAgent()
-    compiled = agent.get_agent()
-    logger.info("Compiled Sudar agent ready for serving.")
-    return compiled
+def _resolve_model(model_provider: Optional[str], model_name: Optional[str]) -> Tuple[str, str]:
+    """Fill in the env defaults so equivalent selections share one cache entry."""
 
+    provider = model_provider or MODEL_PROVIDER
+    if model_name:
+        return provider, model_name
+    if provider == "groq":
+        return provider, GROQ_MODEL_NAME
+    if provider == "google":
+        return provider, GOOGLE_MODEL_NAME
+    return provider, OLLAMA_MODEL
 
-def get_compiled_agent_with_model(model_provider: str = None, model_name: str = None):
-    """Create a compiled agent with specific model configuration."""
+
+@lru_cache(maxsize=4)
+def _compile_agent(model_provider: str, model_name: str):
     agent = TeachAssistAgent(model_provider=model_provider, model_name=model_name)
     compiled = agent.get_agent()
     logger.info(f"Compiled Sudar agent with provider: {model_provider}, model: {model_name}")
     return compiled
 
 
-_agent_lock: Optional[asyncio.Lock] = None
+def get_compiled_agent():
+    """Returns the compiled agent for the default model configuration."""
+    return get_compiled_agent_with_model()
+
 
+def get_compiled_agent_with_model(model_provider: str = None, model_name: str = None):
+    """Returns a cached compiled agent for a specific model configuration.
 
-def get_agent_lock() -> asyncio.Lock:
-    global _agent_lock
-    if _agent_lock is None:
-        _agent_lock = asyncio.Lock()
-    return _agent_lock
+    The graph is compiled once per (provider, model) and shared across users and
+    chats; each conversation is isolated by the thread_id in the stream config.
+    """
+    return _compile_agent(*_resolve_model(model_provider, model_name))
 
 
 def get_default_user_id() -> str:
     return str(USER_ID)
+
+
+# One lock per conversation; entries disappear once no request holds the lock
+_chat_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+async def get_chat_lock(chat_id: str, user_id: str = Depends(get_default_user_id)) -> asyncio.Lock:
+    """Returns the lock serialising agent runs within a single chat.
+
+    Declared async so it runs on the event loop, which makes the get-or-create atomic.
+    """
+    key = f"{user_id}_{chat_id}"
+    lock = _chat_locks.get(key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _chat_locks[key] = lock
+    return lock
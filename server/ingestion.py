@@ -0,0 +1,95 @@
+"""Document ingestion executed in a pool of worker processes."""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from minio.commonconfig import Tags
+
+from agent.tools.RAG.Chunking import ChunkDocument
+from agent.utils import clear_user_chat_context, set_user_chat_context
+from envconfig import MINIO_BUCKET_NAME
+
+from .minio_client import get_minio_client
+
+logger = logging.getLogger(__name__)
+
+
+def ingest_document(object_key: str, user_id: str, chat_id: str) -> str:
+    """Chunks, embeds and indexes an uploaded document, returning the final status tag."""
+
+    set_user_chat_context(user_id, chat_id)
+    minio_client = get_minio_client()
+    status_value = "indexed"
+    try:
+        chunker = ChunkDocument(object_key)
+        chunker.parseDocument()
+        chunker.initializeEmbeddings()
+        chunker.storeEmbeddings()
+        logger.info("Completed ingestion for %s", object_key)
+    except Exception:  # noqa: BLE001
+        logger.exception("Failed to ingest %s", object_key)
+        status_value = "error"
+    finally:
+        set_ingestion_status(minio_client, object_key, status_value)
+        clear_user_chat_context()
+    return status_value
+
+
+def set_ingestion_status(minio_client, object_key: str, status_value: str) -> None:
+    """Rewrites the object's ``status`` tag, keeping its other tags."""
+
+    try:
+        existing_tags = minio_client.get_object_tags(MINIO_BUCKET_NAME, object_key)
+        tag_dict = existing_tags.to_dict() if hasattr(existing_tags, "to_dict") else dict(existing_tags)
+        tag_dict["status"] = status_value
+        tags = Tags(for_object=True)
+        for key, value in tag_dict.items():
+            tags[key] = value
+        minio_client.set_object_tags(MINIO_BUCKET_NAME, object_key, tags)
+    except Exception:  # noqa: BLE001
+        logger.exception("Failed to update ingestion status tags for %s", object_key)
+
+
+_ingestion_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_ingestion_executor() -> ProcessPoolExecutor:
+    """Returns the process pool used for ingestion, creating it on first use."""
+
+    global _ingestion_executor
+    if _ingestion_executor is None:
+        # spawn avoids forking the threaded uvicorn process
+        _ingestion_executor = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _ingestion_executor
+
+
+def submit_ingestion(object_key: str, user_id: str, chat_id: str) -> Future:
+    """Submits ``ingest_document`` to the pool, replacing the pool if a dead worker broke it."""
+
+    global _ingestion_executor
+    executor = get_ingestion_executor()
+    try:
+        return executor.submit(ingest_document, object_key, user_id, chat_id)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM) and the pool refuses new work for good
+        logger.warning("Ingestion pool is broken; starting a new one")
+        if _ingestion_executor is executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            _ingestion_executor = None
+        return get_ingestion_executor().submit(ingest_document, object_key, user_id, chat_id)
+
+
+def shutdown_ingestion_executor() -> None:
+    global _ingestion_executor
+    if _ingestion_executor is not None:
+        _ingestion_executor.shutdown(wait=False, cancel_futures=True)
+        _ingestion_executor = None
@@ -1,39 +1,58 @@
 from __future__ import annotations
 
-import io
+import asyncio
+import json
 import logging
 import os
 import re
+import string
+import threading
+import time
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Iterable, List
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
 
-from fastapi import BackgroundTasks, Depends, FastAPI, File, Form, HTTPException, UploadFile
+from cachetools import TTLCache
+from fastapi import Depends, FastAPI, File, Form, HTTPException, Request, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from minio.commonconfig import Tags
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
+from pydantic import TypeAdapter
 
-from agent.tools.RAG.Chunking import ChunkDocument
+from agent.services.mongo import close_mongo_client, get_mongo_client
 from agent.utils import clear_user_chat_context, set_user_chat_context
-from envconfig import MINIO_BUCKET_NAME
+from envconfig import GOOGLE_MODEL_NAME, GROQ_MODEL_NAME, MINIO_BUCKET_NAME, OLLAMA_MODEL
 
 from .dependencies import (
-    get_agent_lock,
+    get_chat_lock,
     get_chat_service,
     get_checkpoint_service,
     get_compiled_agent,
     get_default_user_id,
+    get_message_writer,
     get_minio_client,
     get_vector_service,
 )
+from .ingestion import (
+    get_ingestion_executor,
+    set_ingestion_status,
+    shutdown_ingestion_executor,
+    submit_ingestion,
+)
 from .schemas import (
     AgentMessage,
+    AgentMessageListAdapter,
     AvailableModelsResponse,
     ChatMessageRequest,
-    ChatMessageResponse,
     ChatSummary,
+    ChatSummaryListAdapter,
     DeleteChatResponse,
     FileMetadata,
+    FileMetadataListAdapter,
+    IngestionStatusResponse,
     ModelInfo,
     NextChatIdResponse,
     UpdateChatNameRequest,
@@ -44,10 +63,36 @@ from .schemas import (
 logger = logging.getLogger("teach-assist-api")
 logging.basicConfig(level=logging.INFO)
 
+# Graph nodes whose updates are surfaced to the user as assistant messages
+_AGENT_NAMES = frozenset({"supervisor", "ContentResearcher", "WorksheetGenerator"})
+
+# Sentinel the agent worker thread enqueues once the stream is exhausted
+_STREAM_END = object()
+
+# Bounded pool for the blocking per-object MinIO calls made while listing files
+_minio_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="minio-io")
+
+# Objects live under "<user_id>/<chat_id>/<type prefix>/" so listings can filter by key
+_TYPE_PREFIXES = {"UploadedDocument": "uploads", "GeneratedContent": "generated"}
+
+# Uploads are streamed to MinIO as multipart uploads of this part size
+_UPLOAD_PART_SIZE = 8 * 1024 * 1024
+
+_PRESIGNED_URL_EXPIRY = timedelta(hours=1)
+# (object_name, etag) -> (tag_dict, download_url); entries expire well before the URLs do
+_object_cache: TTLCache = TTLCache(
+    maxsize=10_000, ttl=min(900, _PRESIGNED_URL_EXPIRY.total_seconds() - 300)
+)
+_object_cache_lock = threading.Lock()
+
+# object_key -> pending ingestion in the worker process pool
+_ingestion_futures: Dict[str, Future] = {}
+
 app = FastAPI(
     title="Teach Assist Agent API",
     version="1.0.0",
     description="API server that powers the Teach Assist AI agent and supporting utilities.",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -59,63 +104,91 @@ app.add_middleware(
 )
 
 
+_SAFE_FILENAME_CHARS = frozenset(string.ascii_letters + string.digits + "._-")
+_SAFE_FILENAME_TABLE = str.maketrans(
+    {c: "_" for c in map(chr, range(128)) if c not in _SAFE_FILENAME_CHARS}
+)
+_UNSAFE_FILENAME_RE = re.compile(r"[^0-9a-zA-Z._-]")
+
+
 def _sanitize_filename(filename: str) -> str:
     base_name = os.path.basename(filename)
     name, ext = os.path.splitext(base_name)
-    safe_name = re.sub(r"[^0-9a-zA-Z._-]", "_", name).strip("._") or "document"
+    # translate covers the common ASCII case; the regex also replaces non-ASCII characters
+    safe_name = name.translate(_SAFE_FILENAME_TABLE) if name.isascii() else _UNSAFE_FILENAME_RE.sub("_", name)
+    safe_name = safe_name.strip("._") or "document"
     return f"{safe_name}{ext or ''}"
 
 
-def _schedule_ingestion(background_tasks: BackgroundTasks, object_key: str, user_id: str, chat_id: str) -> None:
-    def ingest() -> None:
-        set_user_chat_context(user_id, chat_id)
-        minio_client = get_minio_client()
-        status_value = "indexed"
-        try:
-            chunker = ChunkDocument(object_key)
-            chunker.parseDocument()
-            chunker.initializeEmbeddings()
-            chunker.storeEmbeddings()
-            logger.info("Completed ingestion for %s", object_key)
-        except Exception:  # noqa: BLE001
-            logger.exception("Failed to ingest %s", object_key)
-            status_value = "error"
-        finally:
-            try:
-                existing_tags = minio_client.get_object_tags(MINIO_BUCKET_NAME, object_key)
-                tag_dict = existing_tags.to_dict() if hasattr(existing_tags, "to_dict") else dict(existing_tags)
-                tag_dict["status"] = status_value
-                tags = Tags(for_object=True)
-                for key, value in tag_dict.items():
-                    tags[key] = value
-                minio_client.set_object_tags(MINIO_BUCKET_NAME, object_key, tags)
-            except Exception:  # noqa: BLE001
-                logger.exception("Failed to update ingestion status tags for %s", object_key)
-            clear_user_chat_context()
+def _invalidate_object_cache(object_names: Iterable[str]) -> None:
+    names = set(object_names)
+    with _object_cache_lock:
+        for key in [key for key in _object_cache.keys() if key[0] in names]:
+            _object_cache.pop(key, None)
+
+
+def _mark_ingestion_failed(object_key: str) -> None:
+    set_ingestion_status(get_minio_client(), object_key, "error")
+    _invalidate_object_cache([object_key])
+
+
+def _schedule_ingestion(object_key: str, user_id: str, chat_id: str) -> None:
+    future = submit_ingestion(object_key, user_id, chat_id)
+    _ingestion_futures[object_key] = future
+
+    def on_done(done: Future) -> None:
+        if _ingestion_futures.get(object_key) is done:
+            _ingestion_futures.pop(object_key, None)
+        # Tag updates keep the etag, so drop the cached status explicitly
+        _invalidate_object_cache([object_key])
+        if not done.cancelled() and done.exception() is not None:
+            # The worker died before it could tag the object, so the status is set here;
+            # the MinIO calls run off the pool's management thread that invokes this callback
+            logger.error("Ingestion worker failed for %s", object_key, exc_info=done.exception())
+            _minio_executor.submit(_mark_ingestion_failed, object_key)
+
+    future.add_done_callback(on_done)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match may list several entity tags or "*", and uses weak comparison (RFC 9110)
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def _json_list_response(adapter: TypeAdapter, items: list) -> Response:
+    # Serialised by pydantic-core in one pass, bypassing FastAPI's per-item response validation
+    return Response(content=adapter.dump_json(items), media_type="application/json")
 
-    background_tasks.add_task(ingest)
+
+def _sse_event(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def _content_part_text(item: Any) -> str:
+    if type(item) is str:
+        return item
+    if isinstance(item, dict):
+        text = item.get("text")
+        return "" if text is None else str(text)
+    if isinstance(item, str):
+        return item
+    text = getattr(item, "text", None)
+    return str(item) if text is None else str(text)
 
 
 def _stringify_content(content: Any) -> str:
-    if isinstance(content, str):
+    # Exact type check first: plain str is by far the most common content
+    if type(content) is str:
         return content
 
     if isinstance(content, list):
-        parts: List[str] = []
-        for item in content:
-            if isinstance(item, str):
-                parts.append(item)
-            elif isinstance(item, dict):
-                text = item.get("text")
-                if text is not None:
-                    parts.append(str(text))
-            else:
-                text = getattr(item, "text", None)
-                if text is not None:
-                    parts.append(str(text))
-                else:
-                    parts.append(str(item))
-        return "".join(parts)
+        return "".join(map(_content_part_text, content))
+
+    if isinstance(content, str):
+        return content
 
     text = getattr(content, "text", None)
     if text is not None:
@@ -126,25 +199,50 @@ def _stringify_content(content: Any) -> str:
 
 @app.on_event("startup")
 async def warm_up() -> None:
-    get_minio_client()
-    get_chat_service()
-    get_compiled_agent()
+    # Created up front so the concurrent initialisers below share one client; construction does no IO
+    mongo_client = get_mongo_client()
+    required = asyncio.gather(
+        asyncio.to_thread(mongo_client.admin.command, "ping"),
+        asyncio.to_thread(get_minio_client),
+        asyncio.to_thread(get_chat_service),
+        asyncio.to_thread(get_compiled_agent),
+    )
+    # Only the delete endpoints need these, so an outage (e.g. Qdrant down) must not block startup;
+    # the lru_cache does not keep failures, so the first delete retries them
+    optional = asyncio.gather(
+        asyncio.to_thread(get_vector_service),
+        asyncio.to_thread(get_checkpoint_service),
+        return_exceptions=True,
+    )
+    _, optional_results = await asyncio.gather(required, optional)
+    for name, result in zip(("vector service", "checkpoint service"), optional_results):
+        if isinstance(result, Exception):
+            logger.warning("Could not warm up the %s: %s", name, result)
+    get_message_writer().start()
+    get_ingestion_executor()
     logger.info("Teach Assist Agent API ready")
 
 
+@app.on_event("shutdown")
+async def shut_down() -> None:
+    shutdown_ingestion_executor()
+    await get_message_writer().stop()
+    # Last, since the message writer flushes its queue through this client
+    close_mongo_client()
+
+
 @app.get("/api/chats", response_model=List[ChatSummary])
 async def list_user_chats(
     user_id: str = Depends(get_default_user_id),
     chat_service=Depends(get_chat_service),
 ):
     chats = chat_service.getUserChatList(user_id)
-    return [ChatSummary(**chat) for chat in chats]
+    return _json_list_response(ChatSummaryListAdapter, ChatSummaryListAdapter.validate_python(chats))
 
 
 @app.get("/api/chats/next-id", response_model=NextChatIdResponse)
 async def get_next_chat_identifier(
     user_id: str = Depends(get_default_user_id),
-    chat_service=Depends(get_chat_service),
 ):
     # Generate a new UUID for the chat ID
     next_id = str(uuid.uuid4())
@@ -154,33 +252,45 @@ async def get_next_chat_identifier(
 @app.get("/api/chats/{chat_id}", response_model=List[AgentMessage])
 async def get_chat_history(
     chat_id: str,
+    request: Request,
     user_id: str = Depends(get_default_user_id),
     chat_service=Depends(get_chat_service),
 ):
+    # Read before the messages: a write landing in between only makes the next request refetch
+    etag = f'W/"{chat_service.getChatVersion(user_id, chat_id)}"'
+    # no-cache makes browsers revalidate with If-None-Match on every refetch
+    cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cache_headers)
+
     messages = chat_service.getUserChat(user_id, chat_id)
-    normalized: List[AgentMessage] = []
+    normalized: List[dict] = []
     for message in messages:
         role = message.get("role", "").lower()
         normalized_role = "assistant" if role in {"ai", "assistant"} else "user"
         normalized.append(
-            AgentMessage(
-                role=normalized_role,
-                content=_stringify_content(message.get("message", "")),
-                agent=message.get("agent"),
-                timestamp=message.get("timestamp"),
-            )
+            {
+                "role": normalized_role,
+                "content": _stringify_content(message.get("message", "")),
+                "agent": message.get("agent"),
+                "timestamp": message.get("timestamp"),
+            }
         )
-    return normalized
+    response = _json_list_response(AgentMessageListAdapter, AgentMessageListAdapter.validate_python(normalized))
+    response.headers.update(cache_headers)
+    return response
 
 
-@app.post("/api/chats/{chat_id}/messages", response_model=ChatMessageResponse)
+@app.post("/api/chats/{chat_id}/messages")
 async def send_message_to_agent(
     chat_id: str,
     payload: ChatMessageRequest,
     user_id: str = Depends(get_default_user_id),
     chat_service=Depends(get_chat_service),
-    agent_lock=Depends(get_agent_lock),
+    chat_lock=Depends(get_chat_lock),
+    message_writer=Depends(get_message_writer),
 ):
+    """Stream the agent replies as server-sent events, one ``message`` event per AgentMessage."""
     user_message = payload.message.strip()
     if not user_message:
         raise HTTPException(status_code=400, detail="Message cannot be empty.")
@@ -197,62 +307,87 @@ async def send_message_to_agent(
     try:
         chat_service.insertHumanMessage(user_message, user_id, chat_id)
     except Exception as exc:  # noqa: BLE001
-        clear_user_chat_context()
         logger.exception("Failed to persist user message")
         raise HTTPException(status_code=500, detail="Unable to store message.") from exc
+    finally:
+        clear_user_chat_context()
 
-    responses: List[AgentMessage] = []
+    # Invariant across the stream, so built once per request
+    config = {"configurable": {"thread_id": f"{user_id}_{chat_id}"}}
+    agent_input = {"messages": [{"role": "user", "content": user_message}]}
 
-    try:
-        async with agent_lock:
-            from asyncio import get_running_loop
-
-            loop = get_running_loop()
-
-            def run_agent_interaction() -> List[AgentMessage]:
-                set_user_chat_context(user_id, chat_id)
-                responses: List[AgentMessage] = []
-                config = {"configurable": {"thread_id": f"{user_id}_{chat_id}"}}
-                try:
-                    for chunk in compiled_agent.stream(
-                        {"messages": [{"role": "user", "content": user_message}]},
-                        config=config,
-                        stream_mode="updates",
-                    ):
-                        for agent_name in ("supervisor", "ContentResearcher", "WorksheetGenerator"):
-                            if agent_name in chunk:
-                                raw_content = chunk[agent_name]["messages"][-1].content
-                                message_content = _stringify_content(raw_content)
-                                chat_service.insertAIMessage(
-                                    message=message_content,
-                                    user_id=user_id,
-                                    chat_id=chat_id,
-                                    agent_name=agent_name,
-                                )
-                                responses.append(
-                                    AgentMessage(
-                                        role="assistant",
-                                        content=message_content,
-                                        agent=agent_name,
-                                        timestamp=datetime.utcnow(),
-                                    )
-                                )
-                                break
-                    return responses
-                except Exception as exc:  # noqa: BLE001
-                    logger.exception("Agent interaction failed")
-                    raise
-                finally:
-                    clear_user_chat_context()
+    async def event_stream() -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def publish(item: Any) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
 
+        def run_agent_interaction() -> None:
+            # The graph is synchronous, so it runs on a worker thread and hands messages to the queue
+            set_user_chat_context(user_id, chat_id)
+            # One wall-clock read per stream; per-message times are offset with the cheaper monotonic clock
+            started_at = datetime.utcnow()
+            started_monotonic = time.monotonic()
             try:
-                responses = await loop.run_in_executor(None, run_agent_interaction)
+                for chunk in compiled_agent.stream(
+                    agent_input,
+                    config=config,
+                    stream_mode="updates",
+                ):
+                    agent_name = next(iter(chunk.keys() & _AGENT_NAMES), None)
+                    if agent_name is None:
+                        continue
+                    raw_content = chunk[agent_name]["messages"][-1].content
+                    message_content = _stringify_content(raw_content)
+                    timestamp = started_at + timedelta(seconds=time.monotonic() - started_monotonic)
+                    # Persisted by the write-behind queue so Mongo latency stays off the stream
+                    message_writer.submit(
+                        chat_service.buildAIMessage(
+                            message=message_content,
+                            user_id=user_id,
+                            chat_id=chat_id,
+                            agent_name=agent_name,
+                            timestamp=timestamp,
+                        )
+                    )
+                    publish(
+                        AgentMessage(
+                            role="assistant",
+                            content=message_content,
+                            agent=agent_name,
+                            timestamp=timestamp,
+                        )
+                    )
             except Exception as exc:  # noqa: BLE001
-                raise HTTPException(status_code=500, detail="Agent failed to respond.") from exc
-    finally:
-        clear_user_chat_context()
-
-    return ChatMessageResponse(messages=responses)
+                logger.exception("Agent interaction failed")
+                publish(exc)
+            finally:
+                clear_user_chat_context()
+                publish(_STREAM_END)
+
+        async with chat_lock:
+            producer = loop.run_in_executor(None, run_agent_interaction)
+            try:
+                while True:
+                    item = await queue.get()
+                    if item is _STREAM_END:
+                        break
+                    if isinstance(item, Exception):
+                        yield _sse_event("error", json.dumps({"detail": "Agent failed to respond."}))
+                        continue
+                    yield _sse_event("message", item.model_dump_json())
+            finally:
+                # A client disconnect cancels the generator, but the agent thread keeps writing
+                # checkpoints for this thread_id, so the lock is held until it finishes
+                await asyncio.shield(producer)
+        yield _sse_event("done", "{}")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.put("/api/chats/{chat_id}/name", response_model=UpdateChatNameResponse)
@@ -284,58 +419,74 @@ async def delete_chat(
     minio_client=Depends(get_minio_client),
     vector_service=Depends(get_vector_service),
     checkpoint_service=Depends(get_checkpoint_service),
+    chat_lock=Depends(get_chat_lock),
+    message_writer=Depends(get_message_writer),
 ):
     """Delete a chat and all associated files, messages, embeddings, and checkpoints"""
+
+    # Wait out any agent run on this chat and write its queued replies first, so no
+    # message lands after the delete and brings the chat back
+    async with chat_lock:
+        await message_writer.flush()
     
-    # First, get count of files and messages for response
-    prefix = f"{user_id}/{chat_id}/"
-    files_to_delete = list(minio_client.list_objects(MINIO_BUCKET_NAME, prefix=prefix, recursive=True))
-    files_count = len(files_to_delete)
+        # First, get count of files and messages for response
+        prefix = f"{user_id}/{chat_id}/"
+        # list_objects is lazy and pages over HTTP, so it is drained off the event loop
+        files_to_delete = await asyncio.to_thread(
+            lambda: list(minio_client.list_objects(MINIO_BUCKET_NAME, prefix=prefix, recursive=True))
+        )
+        files_count = len(files_to_delete)
     
-    # Get message count before deletion
-    chat_messages = chat_service.getUserChat(user_id, chat_id)
-    messages_count = len(chat_messages)
+        # Get message count before deletion
+        messages_count = chat_service.countMessages(user_id, chat_id)
     
-    if messages_count == 0:
-        raise HTTPException(status_code=404, detail="Chat not found")
+        if messages_count == 0:
+            raise HTTPException(status_code=404, detail="Chat not found")
     
-    try:
-        # Delete all files associated with this chat from MinIO
-        for file_obj in files_to_delete:
-            try:
-                minio_client.remove_object(MINIO_BUCKET_NAME, file_obj.object_name)
-            except S3Error as e:
-                logger.warning(f"Failed to delete file {file_obj.object_name}: {e}")
+        try:
+            # Delete all files associated with this chat from MinIO in bulk DeleteObjects requests
+            def remove_chat_files() -> list:
+                # remove_objects is lazy; draining it sends the requests and yields per-object failures
+                return list(
+                    minio_client.remove_objects(
+                        MINIO_BUCKET_NAME,
+                        [DeleteObject(file_obj.object_name) for file_obj in files_to_delete],
+                    )
+                )
+
+            for error in await asyncio.to_thread(remove_chat_files):
+                logger.warning(f"Failed to delete file {error.name}: {error.message}")
+            _invalidate_object_cache(file_obj.object_name for file_obj in files_to_delete)
         
-        # Delete vector embeddings from Qdrant
-        embeddings_deleted = vector_service.delete_chat_embeddings(user_id, chat_id)
+            # Delete vector embeddings from Qdrant
+            embeddings_deleted = await asyncio.to_thread(vector_service.delete_chat_embeddings, user_id, chat_id)
         
-        # Delete LangGraph checkpoints from MongoDB
-        checkpoints_deleted = checkpoint_service.delete_chat_checkpoints(user_id, chat_id)
+            # Delete LangGraph checkpoints from MongoDB; bounded by PURGE_TIMEOUT_SECONDS, so kept
+            # off the event loop where it would stall every open reply stream
+            checkpoints_deleted = await asyncio.to_thread(checkpoint_service.delete_chat_checkpoints, user_id, chat_id)
         
-        # Delete chat history from MongoDB
-        chat_deleted = chat_service.deleteChatHistory(user_id, chat_id)
+            # Delete chat history from MongoDB
+            chat_deleted = chat_service.deleteChatHistory(user_id, chat_id)
         
-        if not chat_deleted:
-            raise HTTPException(status_code=500, detail="Failed to delete chat history")
+            if not chat_deleted:
+                raise HTTPException(status_code=500, detail="Failed to delete chat history")
             
-        return DeleteChatResponse(
-            success=True,
-            message=f"Chat deleted successfully. Removed {messages_count} messages, {files_count} files, {embeddings_deleted} embeddings, and {checkpoints_deleted} checkpoints.",
-            deleted_files_count=files_count,
-            deleted_messages_count=messages_count,
-            deleted_embeddings_count=embeddings_deleted,
-            deleted_checkpoints_count=checkpoints_deleted
-        )
+            return DeleteChatResponse(
+                success=True,
+                message=f"Chat deleted successfully. Removed {messages_count} messages, {files_count} files, {embeddings_deleted} embeddings, and {checkpoints_deleted} checkpoints.",
+                deleted_files_count=files_count,
+                deleted_messages_count=messages_count,
+                deleted_embeddings_count=embeddings_deleted,
+                deleted_checkpoints_count=checkpoints_deleted
+            )
         
-    except Exception as exc:
-        logger.exception(f"Failed to delete chat {chat_id}")
-        raise HTTPException(status_code=500, detail="Failed to delete chat") from exc
+        except Exception as exc:
+            logger.exception(f"Failed to delete chat {chat_id}")
+            raise HTTPException(status_code=500, detail="Failed to delete chat") from exc
 
 
 @app.post("/api/files/upload", response_model=UploadResponse)
 async def upload_file(
-    background_tasks: BackgroundTasks,
     chat_id: str = Form(...),
     file: UploadFile = File(...),
     user_id: str = Depends(get_default_user_id),
@@ -345,13 +496,11 @@ async def upload_file(
         raise HTTPException(status_code=400, detail="Uploaded file must have a filename.")
 
     sanitized_name = _sanitize_filename(file.filename)
-    object_key = f"{user_id}/{chat_id}/{sanitized_name}"
+    object_key = f"{user_id}/{chat_id}/{_TYPE_PREFIXES['UploadedDocument']}/{sanitized_name}"
 
-    file_bytes = await file.read()
-    if not file_bytes:
+    if not await file.read(1):
         raise HTTPException(status_code=400, detail="Uploaded file is empty.")
-
-    data_stream = io.BytesIO(file_bytes)
+    await file.seek(0)
 
     tags = Tags(for_object=True)
     tags["user_id"] = user_id
@@ -361,11 +510,13 @@ async def upload_file(
 
     try:
         set_user_chat_context(user_id, chat_id)
-        minio_client.put_object(
+        await asyncio.to_thread(
+            minio_client.put_object,
             bucket_name=MINIO_BUCKET_NAME,
             object_name=object_key,
-            data=data_stream,
-            length=len(file_bytes),
+            data=file.file,
+            length=-1,
+            part_size=_UPLOAD_PART_SIZE,
             content_type=file.content_type or "application/octet-stream",
             tags=tags,
         )
@@ -375,53 +526,139 @@ async def upload_file(
     finally:
         clear_user_chat_context()
 
-    _schedule_ingestion(background_tasks, object_key, user_id, chat_id)
+    _invalidate_object_cache([object_key])
+    try:
+        _schedule_ingestion(object_key, user_id, chat_id)
+    except Exception:  # noqa: BLE001
+        # The file is already stored, so report the failed ingestion instead of a 500
+        logger.exception("Failed to schedule ingestion for %s", object_key)
+        await asyncio.to_thread(_mark_ingestion_failed, object_key)
+        return UploadResponse(object_key=object_key, message="Upload successful. Ingestion could not be started.", status="error")
 
     return UploadResponse(object_key=object_key, message="Upload successful. Ingestion started.", status="processing")
 
 
-def _filter_tagged_objects(
-    objects: Iterable,
+def _list_chat_objects(minio_client, user_id: str, chat_id: str, expected_type: str) -> List[tuple]:
+    """Returns (object, typed) pairs; typed objects were found under the type prefix."""
+
+    chat_prefix = f"{user_id}/{chat_id}/"
+    typed_prefix = f"{chat_prefix}{_TYPE_PREFIXES[expected_type]}/"
+    typed = [
+        (obj, True)
+        for obj in minio_client.list_objects(MINIO_BUCKET_NAME, prefix=typed_prefix, recursive=True)
+    ]
+    # Objects stored before the typed layout sit directly under the chat prefix
+    legacy = [
+        (obj, False)
+        for obj in minio_client.list_objects(MINIO_BUCKET_NAME, prefix=chat_prefix)
+        if not obj.is_dir
+    ]
+    return typed + legacy
+
+
+def _describe_tagged_object(
+    obj,
+    typed: bool,
     minio_client,
     user_id: str,
     chat_id: str,
     expected_type: str,
-) -> List[FileMetadata]:
-    results: List[FileMetadata] = []
-    for obj in objects:
+) -> Optional[FileMetadata]:
+    cache_key = (obj.object_name, obj.etag)
+    with _object_cache_lock:
+        cached = _object_cache.get(cache_key)
+
+    if cached is not None:
+        tag_dict, download_url = cached
+    elif typed and expected_type == "GeneratedContent":
+        # Generated files are tagged with nothing beyond what their key already encodes
+        tag_dict = {"user_id": user_id, "chat_id": chat_id, "type": expected_type}
+        download_url = None
+    else:
         try:
             tags = minio_client.get_object_tags(MINIO_BUCKET_NAME, obj.object_name)
         except S3Error:
             logger.warning("Failed to fetch tags for %s", obj.object_name)
-            continue
-
+            return None
         tag_dict = tags.to_dict() if hasattr(tags, "to_dict") else dict(tags)
+        download_url = None
+
+    # Ingestion may finish in another worker process, whose done callback cannot invalidate
+    # this cache, so in-flight statuses are always read fresh from MinIO
+    cacheable = tag_dict.get("status") != "processing"
+
+    # Only legacy objects need their ownership and type confirmed from tags
+    if not typed:
         if tag_dict.get("user_id") != user_id or tag_dict.get("chat_id") != chat_id:
-            continue
+            return None
 
         if tag_dict.get("type") != expected_type:
-            continue
+            return None
 
+    if download_url is None:
         try:
             download_url = minio_client.get_presigned_url(
-                "GET", MINIO_BUCKET_NAME, obj.object_name, expires=timedelta(hours=1)
+                "GET", MINIO_BUCKET_NAME, obj.object_name, expires=_PRESIGNED_URL_EXPIRY
             )
         except S3Error:
             logger.exception("Failed to generate download URL for %s", obj.object_name)
-            continue
-
-        results.append(
-            FileMetadata(
-                object_key=obj.object_name,
-                file_name=os.path.basename(obj.object_name),
-                last_modified=obj.last_modified,
-                size=obj.size,
-                download_url=download_url,
-                tags=tag_dict,
-                status=tag_dict.get("status"),
+            return None
+        if cacheable:
+            with _object_cache_lock:
+                _object_cache[cache_key] = (tag_dict, download_url)
+
+    return FileMetadata(
+        object_key=obj.object_name,
+        file_name=os.path.basename(obj.object_name),
+        last_modified=obj.last_modified,
+        size=obj.size,
+        download_url=download_url,
+        tags=tag_dict,
+        status=tag_dict.get("status"),
+    )
+
+
+async def _filter_tagged_objects(
+    minio_client,
+    user_id: str,
+    chat_id: str,
+    expected_type: str,
+) -> List[FileMetadata]:
+    loop = asyncio.get_running_loop()
+    # list_objects is lazy and pages over HTTP, so it is drained off the event loop too
+    objects = await loop.run_in_executor(
+        _minio_executor, _list_chat_objects, minio_client, user_id, chat_id, expected_type
+    )
+    described = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                _minio_executor, _describe_tagged_object, obj, typed, minio_client, user_id, chat_id, expected_type
             )
+            for obj, typed in objects
+        )
+    )
+    return [metadata for metadata in described if metadata is not None]
+
+
+@app.get("/api/files/status/{object_key:path}", response_model=IngestionStatusResponse)
+async def get_ingestion_status(
+    object_key: str,
+    minio_client=Depends(get_minio_client),
+):
+    future = _ingestion_futures.get(object_key)
+    if future is not None and not future.done():
+        return IngestionStatusResponse(object_key=object_key, status="processing")
+
+    loop = asyncio.get_running_loop()
+    try:
+        tags = await loop.run_in_executor(
+            _minio_executor, minio_client.get_object_tags, MINIO_BUCKET_NAME, object_key
         )
-    return results
+    except S3Error as exc:
+        raise HTTPException(status_code=404, detail="File not found") from exc
+
+    tag_dict = tags.to_dict() if hasattr(tags, "to_dict") else dict(tags or {})
+    return IngestionStatusResponse(object_key=object_key, status=tag_dict.get("status"))
 
 
 @app.get("/api/files/generated/{chat_id}", response_model=List[FileMetadata])
@@ -430,9 +667,8 @@ async def list_generated_content(
     user_id: str = Depends(get_default_user_id),
     minio_client=Depends(get_minio_client),
 ):
-    prefix = f"{user_id}/{chat_id}/"
-    objects = minio_client.list_objects(MINIO_BUCKET_NAME, prefix=prefix, recursive=True)
-    return _filter_tagged_objects(objects, minio_client, user_id, chat_id, expected_type="GeneratedContent")
+    files = await _filter_tagged_objects(minio_client, user_id, chat_id, expected_type="GeneratedContent")
+    return _json_list_response(FileMetadataListAdapter, files)
 
 
 @app.get("/api/files/uploads/{chat_id}", response_model=List[FileMetadata])
@@ -441,16 +677,11 @@ async def list_uploaded_documents(
     user_id: str = Depends(get_default_user_id),
     minio_client=Depends(get_minio_client),
 ):
-    prefix = f"{user_id}/{chat_id}/"
-    objects = minio_client.list_objects(MINIO_BUCKET_NAME, prefix=prefix, recursive=True)
-    return _filter_tagged_objects(objects, minio_client, user_id, chat_id, expected_type="UploadedDocument")
+    files = await _filter_tagged_objects(minio_client, user_id, chat_id, expected_type="UploadedDocument")
+    return _json_list_response(FileMetadataListAdapter, files)
 
 
-@app.get("/api/models", response_model=AvailableModelsResponse)
-async def get_available_models():
-    """Get list of available AI models from different providers."""
-    from envconfig import OLLAMA_MODEL, GROQ_MODEL_NAME, GOOGLE_MODEL_NAME
-    
+def _build_available_models_json() -> bytes:
     models = [
         ModelInfo(
             provider="ollama",
@@ -468,5 +699,14 @@ async def get_available_models():
             display_name=f"Google - {GOOGLE_MODEL_NAME or 'gemini-pro'}"
         ),
     ]
-    
-    return AvailableModelsResponse(models=models)
+    return AvailableModelsResponse(models=models).model_dump_json().encode()
+
+
+# The model list only depends on env configuration, so it is serialised once at import
+_AVAILABLE_MODELS_JSON = _build_available_models_json()
+
+
+@app.get("/api/models", response_model=AvailableModelsResponse)
+async def get_available_models():
+    """Get list of available AI models from different providers."""
+    return Response(content=_AVAILABLE_MODELS_JSON, media_type="application/json")
@@ -0,0 +1,99 @@
+"""Write-behind persistence for assistant messages produced while streaming."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from agent.services import ChatService
+
+logger = logging.getLogger(__name__)
+
+
+class MessageWriter:
+    """Batches chat message documents and writes them with insert_many off the streaming path."""
+
+    def __init__(self, chat_service: ChatService, max_batch_size: int = 50, max_delay: float = 0.2):
+        self._chat_service = chat_service
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Starts the consumer task on the running event loop."""
+
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flushes pending documents and stops the consumer task."""
+
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+        self._loop = None
+
+    async def flush(self) -> None:
+        """Waits until every document submitted so far has been written."""
+
+        if self._task is None:
+            return
+        flushed = self._loop.create_future()
+        # call_soon queues the marker behind puts already scheduled by submit()
+        self._loop.call_soon(self._queue.put_nowait, flushed)
+        await flushed
+
+    def submit(self, document: Dict) -> None:
+        """Queues a document for writing; safe to call from worker threads."""
+
+        if self._loop is None:
+            # Not started (e.g. used outside the API server): write synchronously
+            self._chat_service.insertMessages([document])
+            return
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, document)
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            document = await self._queue.get()
+            if document is None:
+                break
+            if isinstance(document, asyncio.Future):
+                # Everything queued before the marker was written by the previous batch
+                document.set_result(None)
+                continue
+            batch: List[Dict] = [document]
+            flushed: Optional[asyncio.Future] = None
+            deadline = self._loop.time() + self._max_delay
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    document = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if document is None:
+                    stopping = True
+                    break
+                if isinstance(document, asyncio.Future):
+                    flushed = document
+                    break
+                batch.append(document)
+            await self._flush(batch)
+            if flushed is not None:
+                flushed.set_result(None)
+
+    async def _flush(self, batch: List[Dict]) -> None:
+        try:
+            await asyncio.to_thread(self._chat_service.insertMessages, batch)
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to write %d queued chat messages", len(batch))
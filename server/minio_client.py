@@ -0,0 +1,69 @@
+"""MinIO client shared by the API and the ingestion worker processes.
+
+Kept free of agent and FastAPI imports so spawned ingestion workers stay light.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict
+
+from minio import Minio
+from minio import signer as minio_signer
+from minio.time import to_signer_date
+
+from envconfig import MINIO_ACCESS_KEY, MINIO_BUCKET_NAME, MINIO_SECRET_KEY, MINIO_URL
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_signing_keys() -> None:
+    """Memoises SigV4 signing-key derivation inside minio-py.
+
+    The key is four chained HMACs over (secret, day, region, service) and is identical
+    for every request and presigned URL signed on the same day, so it is derived once.
+    """
+
+    original = getattr(minio_signer, "_get_signing_key", None)
+    if original is None or getattr(original, "_is_cached", False):
+        return
+
+    signing_keys: Dict[tuple, bytes] = {}
+
+    def get_signing_key(secret_key: str, date: datetime, region: str, service_name: str) -> bytes:
+        cache_key = (secret_key, to_signer_date(date), region, service_name)
+        signing_key = signing_keys.get(cache_key)
+        if signing_key is None:
+            if len(signing_keys) > 32:
+                signing_keys.clear()
+            signing_key = original(secret_key, date, region, service_name)
+            signing_keys[cache_key] = signing_key
+        return signing_key
+
+    get_signing_key._is_cached = True
+    minio_signer._get_signing_key = get_signing_key
+
+
+@lru_cache(maxsize=1)
+def get_minio_client() -> Minio:
+    """Returns a cached MinIO client instance."""
+
+    _cache_signing_keys()
+
+    endpoint = str(MINIO_URL).replace("http://", "").replace("https://", "")
+    client = Minio(
+        endpoint=endpoint,
+        access_key=MINIO_ACCESS_KEY,
+        secret_key=MINIO_SECRET_KEY,
+        secure=MINIO_URL.startswith("https"),
+    )
+    logger.debug("Initialised MinIO client for endpoint %s", endpoint)
+
+    # Ensure bucket exists
+    if not client.bucket_exists(MINIO_BUCKET_NAME):
+        logger.info("Bucket %s missing; creating it now", MINIO_BUCKET_NAME)
+        client.make_bucket(MINIO_BUCKET_NAME)
+
+    return client
@@ -3,27 +3,29 @@ from __future__ import annotations
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
-class ChatMessageRequest(BaseModel):
+class _Schema(BaseModel):
+    """Base for every API model: unknown fields are dropped and instances are immutable."""
+
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+
+class ChatMessageRequest(_Schema):
     message: str = Field(..., min_length=1, description="User message to send to the agent")
     model_provider: Optional[str] = Field(None, description="Model provider (ollama, groq, google)")
     model_name: Optional[str] = Field(None, description="Specific model name")
 
 
-class AgentMessage(BaseModel):
+class AgentMessage(_Schema):
     role: str
     content: str
     agent: Optional[str] = None
     timestamp: datetime
 
 
-class ChatMessageResponse(BaseModel):
-    messages: List[AgentMessage]
-
-
-class ChatSummary(BaseModel):
+class ChatSummary(_Schema):
     chat_id: str
     chat_name: Optional[str] = None
     message_count: int
@@ -31,7 +33,7 @@ class ChatSummary(BaseModel):
     last_message_time: Optional[datetime] = None
 
 
-class FileMetadata(BaseModel):
+class FileMetadata(_Schema):
     object_key: str
     file_name: str
     last_modified: Optional[datetime]
@@ -41,21 +43,26 @@ class FileMetadata(BaseModel):
     status: Optional[str] = None
 
 
-class UploadResponse(BaseModel):
+class UploadResponse(_Schema):
     object_key: str
     message: str
     status: Optional[str] = None
 
 
-class NextChatIdResponse(BaseModel):
+class IngestionStatusResponse(_Schema):
+    object_key: str
+    status: Optional[str] = None
+
+
+class NextChatIdResponse(_Schema):
     next_chat_id: str
 
 
-class UpdateChatNameRequest(BaseModel):
+class UpdateChatNameRequest(_Schema):
     chat_name: str = Field(..., min_length=1, max_length=100, description="New name for the chat")
 
 
-class DeleteChatResponse(BaseModel):
+class DeleteChatResponse(_Schema):
     success: bool
     message: str
     deleted_files_count: int = 0
@@ -64,18 +71,24 @@ class DeleteChatResponse(BaseModel):
     deleted_checkpoints_count: int = 0
 
 
-class UpdateChatNameResponse(BaseModel):
+class UpdateChatNameResponse(_Schema):
     success: bool
     message: str
     chat_id: str
     chat_name: str
 
 
-class ModelInfo(BaseModel):
+class ModelInfo(_Schema):
     provider: str
     name: str
     display_name: str
 
 
-class AvailableModelsResponse(BaseModel):
+class AvailableModelsResponse(_Schema):
     models: List[ModelInfo]
+
+
+# Validate/serialise whole lists in one pydantic-core call instead of per element
+AgentMessageListAdapter = TypeAdapter(List[AgentMessage])
+ChatSummaryListAdapter = TypeAdapter(List[ChatSummary])
+FileMetadataListAdapter = TypeAdapter(List[FileMetadata])